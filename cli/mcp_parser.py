@@ -1,33 +1,132 @@
 import json
+import orjson # Faster JSON decode/encode: pip install orjson
 import re
 import requests # Make sure to install this: pip install requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlparse, urlunparse # Added urlunparse
 from urlextract import URLExtract # Added for robust URL extraction
-from bs4 import BeautifulSoup # Added for HTML to text conversion
+from bs4 import BeautifulSoup, FeatureNotFound # Added for HTML to text conversion
+from selectolax.lexbor import LexborHTMLParser # Fast script-tag scan: pip install selectolax
 import importlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# --- Precompiled regular expressions (compiled once at import instead of per call) ---
+# Single linear pass over strings, // comments and /* */ comments. The three
+# alternatives are mutually exclusive and have no internal backtracking; group 1
+# captures string literals so "//" or "/*" inside a string is preserved.
+_RE_STRIP_COMMENTS = re.compile(r'("(?:\\.|[^"\\])*"?)|//[^\n]*|/\*[^*]*\*+(?:[^/*][^*]*\*+)*/?', re.DOTALL)
+_RE_ELLIPSIS = re.compile(r"\.{3}")
+_RE_TRAIL_COMMA = re.compile(r",\s*(\}|\])")
+# Body is scanned with mutually exclusive alternatives (any non-backtick, or a backtick
+# that does not start the closing fence), so there is no ambiguous backtracking
+_RE_JSON_CODE_BLOCK = re.compile(r"```json[^\n]*\n((?:[^`]|`(?!``))*)\n?```")
+# The npx scan runs over the full text of every page, so it uses Google RE2 (pip install
+# google-re2) when available for linear-time matching, falling back to the re module.
+# RE2's \s and \w are ASCII-only, so the re fallback is compiled with re.ASCII and the
+# non-breaking space (what &nbsp; becomes in extracted text) is listed explicitly;
+# both engines then match exactly the same commands.
+_NPX_PATTERN = r'npx[\s\xa0]+-y[\s\xa0]+([@\w.-]+(?:/[@\w.-]+)?)[\s\xa0]+(?:mcp[\s\xa0]+)?([^\n\r<]+)' # Made mcp optional and allowed '@'
+if importlib.util.find_spec("re2") is not None:
+    _RE_NPX = importlib.import_module("re2").compile(_NPX_PATTERN)
+else:
+    _RE_NPX = re.compile(_NPX_PATTERN, re.ASCII)
+_RE_TRAIL_PUNCT = re.compile(r'[.,;!?()*\'"]+$')
+_RE_COLON = re.compile(r"\s*:")
+_RE_MCP_KEY = re.compile(r'"mcpServers"\s*:\s*\{')
+# Characters that matter when scanning for a balanced {...} / [...] structure
+_RE_SIGNIFICANT = re.compile(r'[{}\[\]"\\]')
+
+# --- Helper to build a BeautifulSoup tree, preferring the C-based lxml parser ---
+
+def _make_soup(page_content):
+    """
+    Parse HTML with the lxml backend (pip install lxml), which is several times
+    faster than html.parser. Falls back to html.parser if lxml is not installed.
+    """
+    try:
+        return BeautifulSoup(page_content, "lxml")
+    except FeatureNotFound:
+        return BeautifulSoup(page_content, "html.parser")
+
+# --- Helpers working on a single parsed HTML tree (parsed once per page) ---
+
+def _find_json_script_tags(html_tree):
+    """
+    Returns the <script type="application/json"> nodes of a parsed page.
+    """
+    return html_tree.css('script[type="application/json"]')
+
+def _extract_plain_text(html_tree):
+    """
+    Returns the visible text of a parsed page. Like BeautifulSoup's get_text, the
+    contents of <script> and <style> are left out. Note: mutates html_tree.
+    """
+    html_tree.strip_tags(['script', 'style'])
+    root_node = html_tree.body or html_tree.root
+    return root_node.text(separator=" ") if root_node is not None else ""
+
+def _html_to_plain_text(page_content, html_tree=None, log=print):
+    """
+    Returns the visible text of an HTML page, reusing html_tree if the page was
+    already parsed. Falls back to lxml's text_content() (when installed) if selectolax fails, to
+    BeautifulSoup only if lxml cannot parse the page either (e.g. a str with an
+    XML encoding declaration), and to the raw page_content as a last resort.
+    Warnings go to log.
+    """
+    try:
+        if html_tree is None:
+            html_tree = LexborHTMLParser(page_content)
+        return _extract_plain_text(html_tree)
+    except Exception as e:
+        log(f"  Warning: selectolax failed to extract text from HTML: {e}. Retrying with lxml.")
+    try:
+        # Imported lazily: lxml is optional (pip install lxml); without it this tier
+        # is skipped and _make_soup falls back to html.parser
+        from lxml import etree, html as lxml_html
+    except ImportError:
+        lxml_html = None
+    if lxml_html is not None:
+        try:
+            lxml_tree = lxml_html.fromstring(page_content)
+            etree.strip_elements(lxml_tree, 'script', 'style', with_tail=False)
+            return str(lxml_tree.text_content()) # Single C-level pass over all descendant text
+        except Exception as e:
+            log(f"  Warning: lxml failed to parse HTML: {e}. Retrying with BeautifulSoup.")
+    try:
+        soup = _make_soup(page_content)
+        return soup.get_text(separator=" ")
+    except Exception as e:
+        log(f"  Warning: BeautifulSoup failed to parse HTML: {e}. Falling back to raw page_content for attempts 2b/3.")
+        return page_content # Fallback to raw content if BS fails
 
 # --- Helper to robustly parse JSON, allowing comments via json5 if available ---
 
+def _keep_string_literal(match):
+    """Replacement for _RE_STRIP_COMMENTS: keep string literals, drop comments."""
+    return match.group(1) if match.group(1) is not None else ""
+
 def _try_parse_json(json_str):
     """
-    Attempt to parse a JSON string. First with the built-in json module, then
-    after stripping line comments (// ...), and finally with json5 if the
-    library is installed. Returns the parsed object on success or None on
-    failure.
+    Attempt to parse a JSON string. First with orjson, then with the built-in
+    json module after stripping comments (// ... and /* ... */), and finally with
+    json5 if the library is installed. Returns the parsed object on success or
+    None on failure.
     """
     # First attempt: strict JSON
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError:
         pass
 
-    # Second attempt: strip // line comments and /* */ block comments and retry
-    no_comments = re.sub(r"//.*?$", "", json_str, flags=re.MULTILINE)
-    no_comments = re.sub(r"/\*.*?\*/", "", no_comments, flags=re.DOTALL)
+    # Second attempt: strip // line comments and /* */ block comments (outside of
+    # string literals) and retry
+    no_comments = _RE_STRIP_COMMENTS.sub(_keep_string_literal, json_str)
     # Remove standalone ellipsis lines or in-line ellipsis
-    no_comments = re.sub(r"\.{3}", "", no_comments)
+    no_comments = _RE_ELLIPSIS.sub("", no_comments)
     # Remove trailing commas before } or ]
-    no_comments = re.sub(r",\s*(\}|\])", r"\1", no_comments)
+    no_comments = _RE_TRAIL_COMMA.sub(r"\1", no_comments)
 
     try:
         return json.loads(no_comments)
@@ -46,25 +145,55 @@ def _try_parse_json(json_str):
 
 def trim_data_recursively(data):
     """
-    Recursively trims whitespace from string values and string keys in nested data structures.
+    Trims whitespace from string values and string keys in nested data structures.
+    Containers are walked with an explicit stack and updated in place; strings and
+    keys that are already clean are left untouched, so clean data allocates nothing.
+    Returns the trimmed data.
     """
-    if isinstance(data, dict):
-        new_dict = {}
-        for k, v in data.items():
-            trimmed_key = k.strip() if isinstance(k, str) else k
-            new_dict[trimmed_key] = trim_data_recursively(v)
-        return new_dict
-    elif isinstance(data, list):
-        return [trim_data_recursively(item) for item in data]
-    elif isinstance(data, str):
+    if isinstance(data, str):
         return data.strip()
-    else:
-        return data
+    stack = [data]
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            # Only rebuild the dict (preserving order) if some key actually needs trimming
+            if any(isinstance(k, str) and k.strip() is not k for k in container):
+                items = list(container.items())
+                container.clear()
+                for k, v in items:
+                    container[k.strip() if isinstance(k, str) else k] = v
+            slots = container.items()
+        elif isinstance(container, list):
+            slots = enumerate(container)
+        else:
+            continue
+        for slot, value in slots:
+            if isinstance(value, str):
+                stripped_value = value.strip()
+                if stripped_value is not value: # str.strip returns the same object when nothing changed
+                    container[slot] = stripped_value
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return data
 
 # --- Configuration ---
 INPUT_URL_FILE = "mcp_urls.txt"
 OUTPUT_JSON_FILE = "urls_mcp_servers.json"
+PROCESSED_URLS_FILE = "processed_urls.txt" # one URL per line; URLs whose data is already in OUTPUT_JSON_FILE
 REQUEST_TIMEOUT = 10 # seconds for HTTP requests
+NON_HTML_SUFFIXES = (".json", ".toml", ".yaml", ".yml") # URL paths never parsed as HTML
+MAX_RESPONSE_BYTES = 2_000_000 # stop reading an HTML response body after this many bytes
+RESPONSE_CHUNK_SIZE = 65536
+IGNORED_CONTENT_TYPES = ( # response bodies of these types are never downloaded
+    "image/", "font/", "audio/", "video/",
+    "text/css", "application/javascript", "text/javascript"
+)
+MAX_SCRIPT_JSON_CHARS = 1_000_000 # larger <script type="application/json"> payloads are not decoded
+MAX_WORKERS = 8 # concurrent URL fetches
+SAVE_EVERY_N_ITEMS = 25 # rewrite OUTPUT_JSON_FILE at most once per this many new items
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
 IGNORED_EXTENSIONS = {
     # Images
     ".ico", ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp", ".svg",
@@ -73,97 +202,147 @@ IGNORED_EXTENSIONS = {
     # Scripts
     ".js"
 }
+# Single compiled check for IGNORED_EXTENSIONS at the end of the URL path. The match is
+# anchored to the part before any query/fragment, so e.g. "?to=a.png" or "#x.css" don't count.
+_RE_IGNORED_EXT = re.compile(
+    r"^[^?#]*(?:" + "|".join(re.escape(ext) for ext in sorted(IGNORED_EXTENSIONS)) + r")(?:$|[?#])",
+    re.IGNORECASE
+)
 # ---
 
 def _find_balanced_structure(text_content, start_char_idx, open_char, close_char):
     """
     Tries to find a balanced structure (e.g., JSON object or array) in text_content,
     beginning the search for open_char at or after start_char_idx.
+    Braces inside JSON string literals (including escaped quotes) are ignored.
     Returns the substring of the balanced structure, or None if not found or unbalanced.
     """
-    # Find the first opening character at or after start_char_idx, skipping leading whitespace
-    search_text = text_content[start_char_idx:]
-    # We need to escape the open_char if it's a special regex character, e.g., '{', '['.
-    # For simplicity here, assuming open_char is not a character that needs complex regex escaping beyond basic literal match.
-    # A robust solution might use re.escape(open_char).
-    match = re.search(r"\s*" + re.escape(open_char), search_text)
-    if not match:
+    # Find the first opening character at or after start_char_idx (a plain substring
+    # search; no regex or slice copy of the remaining text is needed)
+    struct_open_idx = text_content.find(open_char, start_char_idx)
+    if struct_open_idx == -1:
         return None # No open_char found
-    
-    # struct_open_idx is the index of open_char relative to the original text_content
-    struct_open_idx = start_char_idx + search_text.find(open_char, match.start())
 
+    # Hop between significant characters with a compiled regex so the scan over
+    # everything in between happens in C rather than one Python iteration per char
     counter = 0
-    for i in range(struct_open_idx, len(text_content)):
-        char = text_content[i]
-        if char == open_char:
+    in_string = False
+    pos = struct_open_idx
+    while True:
+        match = _RE_SIGNIFICANT.search(text_content, pos)
+        if not match:
+            return None
+        char = match.group()
+        pos = match.end()
+        if in_string:
+            if char == '\\':
+                pos += 1 # Skip the escaped character
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == open_char:
             counter += 1
         elif char == close_char:
             counter -= 1
             if counter == 0:
-                return text_content[struct_open_idx : i + 1]
-    return None
+                return text_content[struct_open_idx : pos]
 
-def parse_page_content_for_data(response):
+def parse_page_content_for_data(response, page_content, log=print):
     """
     Parses page content from HTTP response for mcpServers JSON or npx commands.
+    page_content is the decoded (and possibly size-capped) response body.
+    Progress and debug messages go to log (print by default).
     Returns a dictionary with extracted data.
     """
     discovered_data = {}
-    page_content = response.text
+    html_tree = None # Parsed once in Attempt 1.5 and reused for the plain-text pass
     content_type = response.headers.get('Content-Type', '').lower()
+    is_json_content = 'application/json' in content_type or content_type.startswith('text/json')
+    # Raw JSON/TOML/YAML files (e.g. on raw.githubusercontent.com, often served as text/plain)
+    # contain no markup, so HTML parsing is skipped for them entirely. The suffix rule does not
+    # apply to text/html responses: GitHub /blob/.../*.json pages are HTML despite the suffix.
+    is_html_content = not is_json_content and (
+        'text/html' in content_type or
+        not urlparse(response.url).path.lower().endswith(NON_HTML_SUFFIXES)
+    )
+
+    # Cheap substring checks that let us skip attempts which cannot match this page
+    has_mcp_key = "mcpServers" in page_content
+    has_server_fields = has_mcp_key or '"command"' in page_content or '"args"' in page_content
+    has_code_block = "```json" in page_content
+    has_npx = "npx" in page_content
 
     # Attempt 1: Direct JSON parse (if content type is application/json)
-    if 'application/json' in content_type:
+    if is_json_content and has_mcp_key:
         try:
-            potential_json_data = json.loads(page_content)
+            potential_json_data = orjson.loads(page_content)
             if (isinstance(potential_json_data, dict) and
                 "mcpServers" in potential_json_data and
                 isinstance(potential_json_data.get("mcpServers"), dict)):
                 discovered_data.update(trim_data_recursively(potential_json_data["mcpServers"]))
                 if discovered_data:
-                    print("  Data found via Attempt 1 (direct JSON parse of mcpServers)")
+                    log("  Data found via Attempt 1 (direct JSON parse of mcpServers)")
                     return discovered_data
-        except json.JSONDecodeError:
-            print("  Content-Type was application/json but failed to parse as a whole or find mcpServers key directly.")
+        except orjson.JSONDecodeError:
+            log("  Content-Type was application/json but failed to parse as a whole or find mcpServers key directly.")
         # If Attempt 1 fails or doesn't find mcpServers, fall through
 
+    # Attempt 1.2 (fast path): "mcpServers": { ... } literally present in the raw content,
+    # e.g. a config block in a README or an embedded JSON script. Found without any HTML parsing.
+    if not discovered_data and has_mcp_key:
+        for key_match in _RE_MCP_KEY.finditer(page_content):
+            json_object_str = _find_balanced_structure(page_content, key_match.end() - 1, '{', '}')
+            if not json_object_str:
+                continue
+            parsed_mcp_servers_obj = _try_parse_json(json_object_str)
+            if isinstance(parsed_mcp_servers_obj, dict) and parsed_mcp_servers_obj:
+                discovered_data.update(trim_data_recursively(parsed_mcp_servers_obj))
+                log("  Data found via Attempt 1.2 (mcpServers JSON in raw content)")
+                return discovered_data
+
     # Attempt 1.5: Look for JSON in <script type="application/json"> tags
-    if not discovered_data: # Only run if Attempt 1 didn't succeed
+    if not discovered_data and is_html_content and has_server_fields: # Only run if Attempt 1 didn't succeed
         try:
-            soup_for_scripts = BeautifulSoup(page_content, "html.parser")
-            script_tags = soup_for_scripts.find_all('script', type='application/json')
+            html_tree = LexborHTMLParser(page_content)
+            script_tags = _find_json_script_tags(html_tree)
             if script_tags:
-                print(f"  Attempt 1.5: Found {len(script_tags)} <script type=\"application/json\"> tag(s).")
+                log(f"  Attempt 1.5: Found {len(script_tags)} <script type=\"application/json\"> tag(s).")
             for tag_idx, script_tag in enumerate(script_tags):
-                script_content = script_tag.string
-                if script_content:
-                    script_content_stripped = script_content.strip()
-                    # print(f"  Attempt 1.5: Processing script #{tag_idx + 1}. Snippet: {script_content_stripped[:100]}...")
-                    try:
-                        parsed_script_json = json.loads(script_content_stripped)
-                        # Log the parsed JSON before applying heuristics
-                        print(f"  Log (Attempt 1.5): Successfully parsed JSON from <script> tag #{tag_idx + 1}. Content type: {type(parsed_script_json)}. Preview (first 200 chars): {str(parsed_script_json)[:200]}")
-                        
-                        if isinstance(parsed_script_json, dict):
-                            # Heuristic 1: Direct "mcpServers" key
-                            if "mcpServers" in parsed_script_json and isinstance(parsed_script_json.get("mcpServers"), dict):
-                                discovered_data.update(trim_data_recursively(parsed_script_json["mcpServers"]))
-                                print("  Data found via Attempt 1.5 (mcpServers in <script>)")
-                                return discovered_data
-                            # Heuristic 2: The entire script content IS the mcpServers object
-                            # Check if all values in the dict are themselves dicts and look like server definitions
-                            elif all(isinstance(val, dict) and (isinstance(val.get("command"), (str, list)) or isinstance(val.get("args"), list)) for val in parsed_script_json.values()):
-                                discovered_data.update(trim_data_recursively(parsed_script_json))
-                                print("  Data found via Attempt 1.5 (entire <script> is mcpServers-like object)")
-                                return discovered_data
-                    except json.JSONDecodeError as e_script:
-                        print(f"  Warning (Attempt 1.5): Failed to parse JSON from <script> tag #{tag_idx + 1}. Error: {e_script}. Snippet: {script_content_stripped[:100]}...")
-                    except Exception as e_generic_script:
-                         # Simplified print statement to avoid potential f-string parsing issues with linter
-                         print("  Warning (Attempt 1.5): Generic error processing script tag #" + str(tag_idx + 1) + ". Error: " + str(e_generic_script))
-        except Exception as e_bs_script:
-            print(f"  Warning (Attempt 1.5): BeautifulSoup parsing or script tag processing failed: {e_bs_script}")
+                script_content = script_tag.text()
+                if len(script_content) > MAX_SCRIPT_JSON_CHARS:
+                    continue
+                # Only scripts that mention mcpServers or server fields can match the heuristics
+                # below, so skip decoding e.g. large analytics/state payloads
+                if ('"mcpServers"' not in script_content and '"command"' not in script_content
+                        and '"args"' not in script_content):
+                    continue
+                script_content_stripped = script_content.strip()
+                # print(f"  Attempt 1.5: Processing script #{tag_idx + 1}. Snippet: {script_content_stripped[:100]}...")
+                try:
+                    parsed_script_json = orjson.loads(script_content_stripped)
+                    # Log the parsed JSON before applying heuristics
+                    log(f"  Log (Attempt 1.5): Successfully parsed JSON from <script> tag #{tag_idx + 1}. Content type: {type(parsed_script_json)}. Preview (first 200 chars): {str(parsed_script_json)[:200]}")
+                    
+                    if isinstance(parsed_script_json, dict):
+                        # Heuristic 1: Direct "mcpServers" key
+                        if "mcpServers" in parsed_script_json and isinstance(parsed_script_json.get("mcpServers"), dict):
+                            discovered_data.update(trim_data_recursively(parsed_script_json["mcpServers"]))
+                            log("  Data found via Attempt 1.5 (mcpServers in <script>)")
+                            return discovered_data
+                        # Heuristic 2: The entire script content IS the mcpServers object
+                        # Check if all values in the dict are themselves dicts and look like server definitions
+                        elif all(isinstance(val, dict) and (isinstance(val.get("command"), (str, list)) or isinstance(val.get("args"), list)) for val in parsed_script_json.values()):
+                            discovered_data.update(trim_data_recursively(parsed_script_json))
+                            log("  Data found via Attempt 1.5 (entire <script> is mcpServers-like object)")
+                            return discovered_data
+                except orjson.JSONDecodeError as e_script:
+                    log(f"  Warning (Attempt 1.5): Failed to parse JSON from <script> tag #{tag_idx + 1}. Error: {e_script}. Snippet: {script_content_stripped[:100]}...")
+                except Exception as e_generic_script:
+                     # Simplified print statement to avoid potential f-string parsing issues with linter
+                     log("  Warning (Attempt 1.5): Generic error processing script tag #" + str(tag_idx + 1) + ". Error: " + str(e_generic_script))
+        except Exception as e_script_scan:
+            log(f"  Warning (Attempt 1.5): HTML parsing or script tag processing failed: {e_script_scan}")
 
     if discovered_data: # If Attempt 1.5 was successful
         return discovered_data
@@ -173,16 +352,15 @@ def parse_page_content_for_data(response):
 
     # Attempt 2a: JSON in Markdown-style code blocks (```json ... ```)
     # This is tried before full HTML stripping for potentially cleaner JSON extraction.
-    json_code_block_pattern = r"```json\s*\n(.*?)\n\s*```"
-    for match in re.finditer(json_code_block_pattern, page_content, re.DOTALL):
+    for match in (_RE_JSON_CODE_BLOCK.finditer(page_content) if has_code_block else ()):
         json_block_content = match.group(1).strip()
         try:
-            parsed_json_from_block = json.loads(json_block_content)
+            parsed_json_from_block = orjson.loads(json_block_content)
             if isinstance(parsed_json_from_block, dict):
                 # Check if this block itself is the mcpServers object or contains it
                 if "mcpServers" in parsed_json_from_block and isinstance(parsed_json_from_block.get("mcpServers"), dict):
                     discovered_data.update(trim_data_recursively(parsed_json_from_block["mcpServers"]))
-                    print("  Data found via Attempt 2a (mcpServers within ```json block)")
+                    log("  Data found via Attempt 2a (mcpServers within ```json block)")
                     return discovered_data # Prioritize this find
                 elif all(isinstance(val, dict) and "command" in val for val in parsed_json_from_block.values()):
                     # Heuristic: If all top-level values look like server definitions (e.g. the block *is* the mcpServers content)
@@ -192,25 +370,24 @@ def parse_page_content_for_data(response):
                             is_potential_mcp_servers_object = False; break
                     if is_potential_mcp_servers_object:
                         discovered_data.update(trim_data_recursively(parsed_json_from_block))
-                        print("  Data found via Attempt 2a (entire ```json block is mcpServers like)")
+                        log("  Data found via Attempt 2a (entire ```json block is mcpServers like)")
                         return discovered_data # Prioritize this find
-        except json.JSONDecodeError:
-            print(f"  Warning (Attempt 2a): Found a ```json block that failed to parse: {json_block_content[:100]}...")
+        except orjson.JSONDecodeError:
+            log(f"  Warning (Attempt 2a): Found a ```json block that failed to parse: {json_block_content[:100]}...")
             continue # Try next json block if current one fails
     
     if discovered_data: # If 2a was successful
         return discovered_data
 
-    # Prepare plain_text using BeautifulSoup for subsequent attempts if not already an application/json type handled by Attempt 1
-    if 'application/json' not in content_type:
-        try:
-            soup = BeautifulSoup(page_content, "html.parser")
-            plain_text_content = soup.get_text(separator=" ")
-        except Exception as e:
-            print(f"  Warning: BeautifulSoup failed to parse HTML: {e}. Falling back to raw page_content for attempts 2b/3.")
-            plain_text_content = page_content # Fallback to raw content if BS fails
+    if not has_mcp_key and not has_npx: # Nothing left for Attempts 2b/3 to find
+        return discovered_data
+
+    # Prepare plain_text for subsequent attempts if the page is HTML.
+    # Reuses the tree parsed in Attempt 1.5 when there is one.
+    if is_html_content:
+        plain_text_content = _html_to_plain_text(page_content, html_tree, log)
     else:
-        # If it was application/json but Attempt 1 (and 1.5) didn't return,
+        # If it was JSON (or a raw config file) but Attempt 1 didn't return,
         # it means it wasn't the specific mcpServers structure we wanted.
         # For Attempts 2b/3 on such a file, treat the original page_content as plain_text.
         plain_text_content = page_content
@@ -227,16 +404,16 @@ def parse_page_content_for_data(response):
     # Attempt 2b: Find "mcpServers" key in plain_text_content (derived from HTML or original if non-HTML)
     mcp_servers_key_str = '"mcpServers"'
     current_search_idx = 0
-    while True:
+    while has_mcp_key:
         key_occurrence_idx = plain_text_content.find(mcp_servers_key_str, current_search_idx)
         if key_occurrence_idx == -1:
             break
         after_key_str_idx = key_occurrence_idx + len(mcp_servers_key_str)
-        colon_match = re.search(r"\s*:", plain_text_content[after_key_str_idx:])
+        colon_match = _RE_COLON.search(plain_text_content, after_key_str_idx)
         if not colon_match:
             current_search_idx = after_key_str_idx
             continue
-        start_of_value_idx = after_key_str_idx + colon_match.end()
+        start_of_value_idx = colon_match.end()
         json_object_str = _find_balanced_structure(plain_text_content, start_of_value_idx, '{', '}')
         if json_object_str:
             # print(f"  Log (Attempt 2b): Potential JSON string found by _find_balanced_structure (full): {json_object_str}") # Log full string
@@ -245,31 +422,30 @@ def parse_page_content_for_data(response):
                 if isinstance(parsed_mcp_servers_obj, dict):
                     discovered_data.update(trim_data_recursively(parsed_mcp_servers_obj))
                     if discovered_data:
-                        print("  Data found via Attempt 2b (mcpServers JSON in plain text)")
+                        log("  Data found via Attempt 2b (mcpServers JSON in plain text)")
                         return discovered_data
             else:
-                print(f"  Warning (Attempt 2b): Found potential mcpServers in plain text that failed to parse: {json_object_str[:100]}...")
+                log(f"  Warning (Attempt 2b): Found potential mcpServers in plain text that failed to parse: {json_object_str[:100]}...")
         current_search_idx = after_key_str_idx
     
     if discovered_data: # If 2b was successful
         return discovered_data
 
     # Attempt 3: Search for npx command phrase in plain_text_content
-    npx_command_pattern = r'npx\s+-y\s+([@\w.-]+(?:/[@\w.-]+)?)\s+(?:mcp\s+)?([^\n\r<]+)' # Made mcp optional and allowed '@'
-    matches = list(re.finditer(npx_command_pattern, plain_text_content))
+    matches = list(_RE_NPX.finditer(plain_text_content)) if has_npx else []
     if not matches:
-        print("  DEBUG: NPX regex found 0 matches in Attempt 3 for this page.")
+        log("  DEBUG: NPX regex found 0 matches in Attempt 3 for this page.")
     else:
-        print(f"  DEBUG: NPX regex matched {len(matches)} command(s).")
+        log(f"  DEBUG: NPX regex matched {len(matches)} command(s).")
     
     npx_found_on_page = False
     for command_match in matches:
         package_name = command_match.group(1).strip() # Group 1 is package
         api_or_argument_part = command_match.group(2).strip() # Group 2 is the rest
-        print(f"  DEBUG (Attempt 3): Raw package_name: '{command_match.group(1)}', api_or_arg: '{command_match.group(2)}'")
+        log(f"  DEBUG (Attempt 3): Raw package_name: '{command_match.group(1)}', api_or_arg: '{command_match.group(2)}'")
         
         # Clean trailing punctuation from the api_or_argument_part
-        api_or_argument_part = re.sub(r'[.,;!?()*\'"]+$', '', api_or_argument_part).strip()
+        api_or_argument_part = _RE_TRAIL_PUNCT.sub('', api_or_argument_part).strip()
         
         command_parts_list = ["npx", "-y", package_name, "mcp", api_or_argument_part]
         
@@ -279,7 +455,7 @@ def parse_page_content_for_data(response):
         npx_found_on_page = True
     
     if npx_found_on_page:
-        print(f"  Data found via Attempt 3 (npx command(s)): {list(discovered_data.keys())}")
+        log(f"  Data found via Attempt 3 (npx command(s)): {list(discovered_data.keys())}")
         # If npx was found, and previous attempts for mcpServers JSON failed, return npx data.
         return discovered_data
 
@@ -295,16 +471,10 @@ def extract_urls_from_text_file(file_path_urls):
         potential_urls_raw = extractor.find_urls(file_content)
         filtered_urls = []
         for url_str in potential_urls_raw:
-            try:
-                parsed_url = urlparse(url_str)
-                path_lower = parsed_url.path.lower()
-                if not any(path_lower.endswith(ext) for ext in IGNORED_EXTENSIONS):
-                    filtered_urls.append(url_str)
-                else:
-                    print(f"  Ignoring URL (extension): {url_str}")
-            except Exception as e:
-                print(f"  Could not parse or check extension for URL '{url_str}': {e}. Including it.")
-                filtered_urls.append(url_str)
+            if _RE_IGNORED_EXT.search(url_str):
+                print(f"  Ignoring URL (extension): {url_str}")
+                continue
+            filtered_urls.append(url_str)
         urls_found = list(set(filtered_urls)) # Keep unique URLs
     except FileNotFoundError:
         print(f"Error: Input URL file not found at '{file_path_urls}'")
@@ -312,7 +482,123 @@ def extract_urls_from_text_file(file_path_urls):
         print(f"Error reading URL file '{file_path_urls}': {e}")
     return urls_found
 
+def fetch_and_parse(session, url):
+    """
+    Fetches a single URL with the shared session and parses it for server data.
+    Runs in a worker thread, so it never raises: returns (url, extracted_data, messages)
+    on success or (url, exception, messages) on failure. Log messages are buffered in
+    messages rather than printed, so main() can print them under the URL they belong to.
+    """
+    messages = []
+    log = messages.append
+    try:
+        # Stream the body so irrelevant content types are never downloaded and
+        # huge HTML pages are cut off at MAX_RESPONSE_BYTES
+        with session.get(url, timeout=REQUEST_TIMEOUT, allow_redirects=True, stream=True) as response:
+            response.raise_for_status() # Raises an exception for 4XX/5XX errors
+            content_type = response.headers.get('Content-Type', '').lower()
+            if content_type.startswith(IGNORED_CONTENT_TYPES):
+                log(f"  Ignoring URL (content type {content_type}): {url}")
+                return url, {}, messages
+            # JSON and raw config files are read in full: a truncated document never parses
+            is_raw_data = (
+                'application/json' in content_type or content_type.startswith('text/json') or
+                ('text/html' not in content_type and
+                 urlparse(response.url).path.lower().endswith(NON_HTML_SUFFIXES))
+            )
+            page_content = _read_capped_body(response, None if is_raw_data else MAX_RESPONSE_BYTES, log)
+        return url, parse_page_content_for_data(response, page_content, log), messages # Dict of servers or npx commands
+    except Exception as e:
+        return url, e, messages
+
+def _read_capped_body(response, max_bytes=MAX_RESPONSE_BYTES, log=print):
+    """
+    Reads a streamed response body up to max_bytes (None for no cap) and decodes it.
+    """
+    chunks = []
+    total_bytes = 0
+    for chunk in response.iter_content(RESPONSE_CHUNK_SIZE):
+        chunks.append(chunk)
+        total_bytes += len(chunk)
+        if max_bytes is not None and total_bytes > max_bytes:
+            log(f"  Response from {response.url} exceeds {max_bytes} bytes; only the beginning is parsed.")
+            break
+    body = b"".join(chunks)
+    try:
+        return body.decode(response.encoding or 'utf-8', errors='replace')
+    except LookupError: # Unknown charset in the Content-Type header
+        return body.decode('utf-8', errors='replace')
+
+def _write_output_file(all_mcp_servers_list, new_items_count):
+    """
+    Writes the full list of collected items to OUTPUT_JSON_FILE.
+    Returns True if the file was written, False otherwise.
+    """
+    try:
+        # Serialize before opening the file so an encode error cannot truncate it
+        try:
+            serialized = orjson.dumps(all_mcp_servers_list, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            # Values accepted by the stdlib fallback in _try_parse_json (e.g. integers
+            # beyond 64 bits) are rejected by orjson; the stdlib encoder handles them
+            serialized = json.dumps(all_mcp_servers_list, indent=2, ensure_ascii=False).encode('utf-8')
+        with open(OUTPUT_JSON_FILE, 'wb') as f:
+            f.write(serialized)
+        print(f"  {OUTPUT_JSON_FILE} updated with {new_items_count} new item(s). Total items: {len(all_mcp_servers_list)}")
+        return True
+    except (IOError, TypeError, ValueError) as e:
+        print(f"Error writing to {OUTPUT_JSON_FILE}: {e}")
+        return False
+
+def _load_processed_urls(all_mcp_servers_list, output_file_loaded):
+    """
+    Loads the set of already processed URLs from PROCESSED_URLS_FILE. The sidecar is
+    only trusted if OUTPUT_JSON_FILE was actually loaded; otherwise, or if the sidecar
+    does not exist yet, the set is derived from the 'source_url' of each loaded item
+    and the sidecar is rewritten from it, so it never lists URLs whose items are not
+    on disk.
+    """
+    if output_file_loaded:
+        try:
+            with open(PROCESSED_URLS_FILE, 'r', encoding='utf-8') as f:
+                return set(f.read().splitlines())
+        except FileNotFoundError:
+            pass
+    processed_urls = {item["source_url"] for item in all_mcp_servers_list
+                      if isinstance(item, dict) and "source_url" in item}
+    try:
+        with open(PROCESSED_URLS_FILE, 'w', encoding='utf-8') as f:
+            f.writelines(url + "\n" for url in processed_urls)
+    except IOError as e:
+        print(f"Error writing to {PROCESSED_URLS_FILE}: {e}")
+    return processed_urls
+
+def _append_processed_urls(urls):
+    """
+    Appends URLs to PROCESSED_URLS_FILE, one per line.
+    """
+    try:
+        with open(PROCESSED_URLS_FILE, 'a', encoding='utf-8') as f:
+            f.writelines(url + "\n" for url in urls)
+    except IOError as e:
+        print(f"Error writing to {PROCESSED_URLS_FILE}: {e}")
+
+def _create_session():
+    """
+    Creates a requests.Session with a pooled, retrying adapter so that repeated
+    requests to the same host (github.com, raw.githubusercontent.com) reuse
+    keep-alive connections instead of opening a new TCP/TLS connection each time.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                          max_retries=Retry(total=2, backoff_factor=0.3))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(REQUEST_HEADERS)
+    return session
+
 def main():
+    session = _create_session()
     # url_extractor = URLExtract() # No longer needed here as we use a fixed list
 
     # Instead of reading from INPUT_URL_FILE, we use a hardcoded list for now
@@ -337,19 +623,27 @@ def main():
     # We will now load it at the start and append to it.
     
     all_mcp_servers_list = [] # This will store all individual server entries
+    output_file_loaded = False # True once existing items were read from OUTPUT_JSON_FILE
 
     try:
-        with open(OUTPUT_JSON_FILE, 'r') as f:
+        with open(OUTPUT_JSON_FILE, 'rb') as f:
             content = f.read()
             if content.strip(): # Check if file is not empty
+                # A non-empty file that cannot be loaded as a list is never overwritten:
+                # starting from an empty list would drop every item collected before.
                 try:
-                    all_mcp_servers_list = json.loads(content)
-                    if not isinstance(all_mcp_servers_list, list):
-                        print(f"Warning: {OUTPUT_JSON_FILE} does not contain a JSON list. Initializing as empty list.")
-                        all_mcp_servers_list = []
-                except json.JSONDecodeError:
-                    print(f"Warning: {OUTPUT_JSON_FILE} contains invalid JSON. Initializing as empty list.")
-                    all_mcp_servers_list = []
+                    all_mcp_servers_list = orjson.loads(content)
+                except orjson.JSONDecodeError:
+                    # Files written by the stdlib encoder may hold NaN/Infinity, which orjson rejects
+                    try:
+                        all_mcp_servers_list = json.loads(content)
+                    except ValueError as e:
+                        print(f"Error: {OUTPUT_JSON_FILE} contains invalid JSON ({e}). Fix or move the file; not overwriting it.")
+                        return
+                if not isinstance(all_mcp_servers_list, list):
+                    print(f"Error: {OUTPUT_JSON_FILE} does not contain a JSON list. Fix or move the file; not overwriting it.")
+                    return
+                output_file_loaded = True
             else: # File is empty
                  all_mcp_servers_list = []
     except FileNotFoundError:
@@ -357,94 +651,96 @@ def main():
         all_mcp_servers_list = []
 
 
-    processed_urls = set() # To keep track of URLs we've already successfully processed and added
-    # Load previously processed URLs from the existing data if possible
-    # This assumes each item in all_mcp_servers_list has a 'source_url' key
-    for item in all_mcp_servers_list:
-        if isinstance(item, dict) and "source_url" in item:
-            processed_urls.add(item["source_url"])
+    # URLs we've already successfully processed and added, kept in a sidecar file
+    processed_urls = _load_processed_urls(all_mcp_servers_list, output_file_loaded)
+
+    # Index of (id, source_url) pairs already in the list, for O(1) duplicate checks
+    existing_keys = {(item.get("id"), item.get("source_url")) for item in all_mcp_servers_list if isinstance(item, dict)}
 
     urls_checked_count = 0
     positive_imports_count = 0 # This will count URLs that yield at least one server/npx entry
 
     print(f"Starting processing. Initial items in {OUTPUT_JSON_FILE}: {len(all_mcp_servers_list)}")
 
-    for url in urls_to_check:
+    pending_urls = []
+    for url in dict.fromkeys(urls_to_check): # Drop repeated URLs, keep order
         if url in processed_urls:
             print(f"Skipping already processed URL: {url}")
             continue
+        pending_urls.append(url)
 
-        urls_checked_count += 1
-        print(f"Processing URL ({urls_checked_count}/{len(urls_to_check)}): {url}")
-        
-        current_url_extracted_data_count = 0 # To check if this URL yielded any new data
+    items_since_last_write = 0
+    unsaved_processed_urls = [] # Recorded in PROCESSED_URLS_FILE together with each output write
 
+    # Fetching is I/O-bound, so URLs are fetched and parsed concurrently on the shared
+    # session. Deduplication, counting and file writes stay on the main thread.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(fetch_and_parse, session, url): url for url in pending_urls}
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, timeout=REQUEST_TIMEOUT, headers=headers, allow_redirects=True)
-            response.raise_for_status() # Raises an exception for 4XX/5XX errors
-            
-            # print(f"  Status: {response.status_code}, Content-Type: {response.headers.get('Content-Type', 'N/A')}")
-            # page_content = response.text # Store for potential later use if needed, but avoid printing large chunks
-            # print(f"  Raw content snippet (first 200): {page_content[:200]}") # Removed as requested
-
-            extracted_data_for_url = parse_page_content_for_data(response) # This returns a dict of servers or npx commands
-
-            if extracted_data_for_url:
-                print(f"  Successfully extracted data from {url}")
-                new_items_added_for_this_url = 0
-                for key, value in extracted_data_for_url.items():
-                    # Ensure the value is a dictionary (server definition or npx command info)
-                    if isinstance(value, dict):
-                        # Create a new dictionary for each server/npx entry
-                        # This ensures we don't modify the source `value` if it's referenced elsewhere
-                        item_to_add = value.copy() 
-                        item_to_add["id"] = key # The server name or generated npx id
-                        item_to_add["source_url"] = url # Add source URL for tracking
-                        
-                        # Basic duplicate check based on id and source_url (or more comprehensive if needed)
-                        is_duplicate = False
-                        for existing_item in all_mcp_servers_list:
-                            if existing_item.get("id") == item_to_add.get("id") and \
-                               existing_item.get("source_url") == item_to_add.get("source_url"):
-                                # A more robust check might compare more fields if 'id' is not unique enough across different URLs
-                                is_duplicate = True
-                                break
+            for future in as_completed(futures):
+                url, result, messages = future.result()
+                urls_checked_count += 1
+                print(f"Processed URL ({urls_checked_count}/{len(pending_urls)}): {url}")
+                for message in messages:
+                    print(message)
+
+                if isinstance(result, requests.exceptions.Timeout):
+                    print(f"  Request timed out for {url}")
+                elif isinstance(result, requests.exceptions.RequestException):
+                    print(f"  Request failed for {url}: {result}")
+                elif isinstance(result, Exception):
+                    print(f"  An unexpected error occurred processing {url}: {result}")
+                elif result:
+                    print(f"  Successfully extracted data from {url}")
+                    new_items_added_for_this_url = 0
+                    for key, value in result.items():
+                        # Ensure the value is a dictionary (server definition or npx command info)
+                        if isinstance(value, dict):
+                            # Create a new dictionary for each server/npx entry
+                            # This ensures we don't modify the source `value` if it's referenced elsewhere
+                            item_to_add = value.copy() 
+                            item_to_add["id"] = key # The server name or generated npx id
+                            item_to_add["source_url"] = url # Add source URL for tracking
                         
-                        if not is_duplicate:
-                            all_mcp_servers_list.append(item_to_add)
-                            new_items_added_for_this_url +=1
-                            current_url_extracted_data_count +=1
-                        else:
-                            print(f"    Duplicate item '{key}' from {url} not added.")
+                            # Basic duplicate check based on id and source_url (or more comprehensive if needed)
+                            item_key = (key, url)
+                            if item_key not in existing_keys:
+                                existing_keys.add(item_key)
+                                all_mcp_servers_list.append(item_to_add)
+                                new_items_added_for_this_url +=1
+                            else:
+                                print(f"    Duplicate item '{key}' from {url} not added.")
                 
-                if new_items_added_for_this_url > 0:
-                    positive_imports_count += 1 # Count this URL as a positive import
-                    processed_urls.add(url) # Mark as processed only if new data was added
-
-                # Update JSON file after processing each URL if new data was added
-                if new_items_added_for_this_url > 0:
-                    try:
-                        with open(OUTPUT_JSON_FILE, 'w') as f:
-                            json.dump(all_mcp_servers_list, f, indent=4)
-                        print(f"  {OUTPUT_JSON_FILE} updated with {new_items_added_for_this_url} new item(s) from {url}. Total items: {len(all_mcp_servers_list)}")
-                    except IOError as e:
-                        print(f"Error writing to {OUTPUT_JSON_FILE}: {e}")
-            else:
-                print(f"  No relevant data found or extracted from {url}")
-
-        except requests.exceptions.Timeout:
-            print(f"  Request timed out for {url}")
-        except requests.exceptions.RequestException as e:
-            print(f"  Request failed for {url}: {e}")
-        except Exception as e:
-            print(f"  An unexpected error occurred processing {url}: {e}")
-
-        print(f"Progress: URLs checked: {urls_checked_count}, Positive imports (URLs with new data): {positive_imports_count}")
-        print("-" * 30)
-
+                    if new_items_added_for_this_url > 0:
+                        positive_imports_count += 1 # Count this URL as a positive import
+                        processed_urls.add(url) # Mark as processed only if new data was added
+                        unsaved_processed_urls.append(url)
+                        items_since_last_write += new_items_added_for_this_url
+                        print(f"  Added {new_items_added_for_this_url} new item(s) from {url}. Total items: {len(all_mcp_servers_list)}")
+
+                        # Rewriting the whole list is O(N), so only flush once enough new items piled up
+                        if items_since_last_write >= SAVE_EVERY_N_ITEMS:
+                            # URLs only count as processed once their items are on disk;
+                            # after a failed write they stay pending and the write is retried
+                            if _write_output_file(all_mcp_servers_list, items_since_last_write):
+                                _append_processed_urls(unsaved_processed_urls)
+                                items_since_last_write = 0
+                                unsaved_processed_urls.clear()
+                else:
+                    print(f"  No relevant data found or extracted from {url}")
+
+                print(f"Progress: URLs checked: {urls_checked_count}, Positive imports (URLs with new data): {positive_imports_count}")
+                print("-" * 30)
+        except BaseException:
+            # On Ctrl-C (or any error) drop the queued URLs instead of letting the
+            # executor fetch the whole remaining list before exiting
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            # Persist whatever is still unsaved, even if the run is interrupted
+            if items_since_last_write > 0:
+                if _write_output_file(all_mcp_servers_list, items_since_last_write):
+                    _append_processed_urls(unsaved_processed_urls)
 
     print("\\nFinal processing complete.")
     print(f"Total URLs checked: {urls_checked_count}")